@@ -1,5 +1,6 @@
 
 import os
+import sys
 from subprocess import check_output
 from glob import glob
 
@@ -16,17 +17,32 @@ def main():
         raise RuntimeError('Must set environment variables PETSC_DIR, '
                            'PETSC_ARCH and SLEPC_DIR before installing!')
 
-    write_build_headers()
+    # commands that only produce package metadata don't need the headers
+    # regenerated, as long as there are some for cythonize to read
+    metadata_only = any(cmd in sys.argv[1:] for cmd in METADATA_COMMANDS)
+    if not (metadata_only and os.path.exists(HEADER_PATH)):
+        write_build_headers()
 
     setup(
         ext_modules=cythonize(
-            extensions(), include_path=get_cython_includes()
+            extensions(), include_path=get_cython_includes(),
+            compiler_directives=COMPILER_DIRECTIVES
             ),
         cmdclass={'build_ext': MakeBuildExt},
         package_dir={'': 'src'}
     )
 
 
+# the backend checks its inputs explicitly, so skip Cython's per-access checks
+COMPILER_DIRECTIVES = {
+    'language_level': 3,
+    'boundscheck': False,
+    'wraparound': False,
+    'initializedcheck': False,
+    'cdivision': True,
+}
+
+
 def get_cython_includes():
     # the following two replace petsc4py.get_include() and
     # slepc4py.get_include(), so we don't need those two installed
@@ -43,32 +59,102 @@ def get_cython_includes():
     ]
 
 
+METADATA_COMMANDS = ('egg_info', 'dist_info')
+HEADER_PATH = os.path.join(
+    os.path.dirname(__file__),
+    'src/dynamite/_backend/config.pxi'
+)
 def write_build_headers():
     '''
     Write a Cython include file with some constants that become
-    hardcoded into the backend build.
+    hardcoded into the backend build. Nothing is done if the file is
+    already up to date.
     '''
+    # the first line records the PETSc build the header was generated for
+    first_line = '# generated by setup.py for %s\n' % get_petsc_build()
+
+    if build_headers_current(HEADER_PATH, first_line):
+        return
+
     print('Writing header files...')
 
-    commit = check_output(['git', 'describe', '--always'],
-                          cwd=os.path.dirname(os.path.realpath(__file__)),
-                          universal_newlines=True).strip()
-    branch = check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                          cwd=os.path.dirname(os.path.realpath(__file__)),
-                          universal_newlines=True).strip()
+    # get the commit hash and the refs pointing to it in one call to git
+    git_info = check_output(['git', 'log', '-1', '--format=%h%n%D'],
+                            cwd=os.path.dirname(os.path.realpath(__file__)),
+                            universal_newlines=True).splitlines()
+    commit = git_info[0].strip()
+    branch = parse_branch(git_info[1] if len(git_info) > 1 else '')
     version = open('VERSION').read().strip()
 
-    header_path = os.path.join(
-        os.path.dirname(__file__),
-        'src/dynamite/_backend/config.pxi'
-    )
-    with open(header_path, 'w') as f:
+    with open(HEADER_PATH, 'w') as f:
+        f.write(first_line)
         f.write('DEF USE_CUDA = %d\n' % int(check_cuda()))
         f.write('DEF DNM_BRANCH = "%s"\n' % branch)
         f.write('DEF DNM_COMMIT = "%s"\n' % commit)
         f.write('DEF DNM_VERSION = "%s"\n' % version)
 
 
+def parse_branch(refs):
+    '''
+    Get the name of the current branch from git's comma-separated list of
+    refs pointing at HEAD. As with ``git rev-parse --abbrev-ref HEAD``, the
+    result is 'HEAD' if no branch is checked out.
+    '''
+    for ref in refs.split(','):
+        ref = ref.strip()
+        if ref.startswith('HEAD -> '):
+            return ref[len('HEAD -> '):]
+    return 'HEAD'
+
+
+def build_headers_current(header_path, first_line):
+    '''
+    Whether the header file at header_path was generated for the current
+    PETSc build and is newer than everything its contents depend on.
+    '''
+    inputs = build_header_inputs()
+    if inputs is None or not os.path.exists(header_path):
+        return False
+
+    with open(header_path) as f:
+        if f.readline() != first_line:
+            return False
+
+    header_mtime = os.stat(header_path).st_mtime
+    return all(os.path.exists(fname) and os.stat(fname).st_mtime < header_mtime
+               for fname in inputs)
+
+
+def build_header_inputs():
+    '''
+    The files whose modification could change the contents of the build
+    headers, or None if they can't be determined (if we are not in a
+    regular git checkout).
+    '''
+    root = os.path.dirname(os.path.realpath(__file__))
+    git_dir = os.path.join(root, '.git')
+    if not os.path.isdir(git_dir):
+        return None
+
+    head = os.path.join(git_dir, 'HEAD')
+    inputs = [
+        os.path.join(root, 'VERSION'),
+        os.path.join(get_petsc_build(), 'include/petscconf.h'),
+        head
+    ]
+
+    # if we are on a branch, its ref is what changes with each new commit
+    with open(head) as f:
+        ref = f.read().strip()
+    if ref.startswith('ref: '):
+        ref_path = os.path.join(git_dir, ref[len('ref: '):])
+        if not os.path.exists(ref_path):
+            ref_path = os.path.join(git_dir, 'packed-refs')
+        inputs.append(ref_path)
+
+    return inputs
+
+
 def extensions():
 
     extension_names = [
@@ -98,14 +184,17 @@ def extensions():
                 object_files = [f'src/dynamite/_backend/{name}_impl.o']
 
         if name == 'bpetsc':
-            depends += ['src/dynamite/_backend/bsubspace.pxd'
+            depends += ['src/dynamite/_backend/bsubspace.pxd',
                         'src/dynamite/_backend/bcuda_impl.h',
                         'src/dynamite/_backend/bcuda_impl.cu',
-                        'src/dynamite/_backend/shellcontext.h',
+                        'src/dynamite/_backend/shell_context.h',
                         'src/dynamite/_backend/bsubspace_impl.h']
             if check_cuda():
                 object_files += ['src/dynamite/_backend/bcuda_impl.o']
 
+        # make sure the extension gets relinked if make rebuilt an object file
+        depends += object_files
+
         exts += [
             Extension(f'dynamite._backend.{name}',
                       sources=[f'src/dynamite/_backend/{name}.pyx'],
@@ -149,20 +238,29 @@ class MakeBuildExt(build_ext):
 
     def run(self):
 
-        # first remove any old object files which may
-        # correspond to a different PETSC_ARCH
-        for fname in glob('src/dynamite/_backend/*.o'):
-            os.remove(fname)
+        # remove any old object files if they were built against a different
+        # PETSc build; otherwise, leave them so make only rebuilds what changed
+        petsc_build = get_petsc_build()
+        if read_build_arch() != petsc_build:
+            for fname in glob('src/dynamite/_backend/*.o'):
+                os.remove(fname)
+            with open(BUILD_ARCH_FILE, 'w') as f:
+                f.write(petsc_build + '\n')
+
+        jobs = build_jobs()
 
         # build the object files
-        make = check_output(['make', 'bpetsc_impl.o'],
+        targets = ['bpetsc_impl.o']
+        if check_cuda():
+            targets += ['bcuda_impl.o']
+
+        make = check_output(['make', '-j', str(jobs)] + targets,
                             cwd='src/dynamite/_backend')
         print(make.decode(), end='')
 
-        if check_cuda():
-            make = check_output(['make', 'bcuda_impl.o'],
-                                cwd='src/dynamite/_backend')
-            print(make.decode())
+        # also compile the Cython extensions in parallel
+        if self.parallel is None:
+            self.parallel = jobs
 
         # get the correct compiler from SLEPc
         # there is probably a more elegant way to do this
@@ -189,6 +287,36 @@ class MakeBuildExt(build_ext):
                 os.environ.pop('CC')
 
 
+def build_jobs():
+    '''
+    The number of parallel jobs to use when compiling. Can be set with the
+    environment variable DNM_BUILD_JOBS; defaults to the number of CPUs.
+    '''
+    if 'DNM_BUILD_JOBS' in os.environ:
+        return int(os.environ['DNM_BUILD_JOBS'])
+    return os.cpu_count() or 1
+
+
+def get_petsc_build():
+    '''
+    The directory of the PETSc build we are compiling against.
+    '''
+    return os.path.join(os.environ['PETSC_DIR'], os.environ['PETSC_ARCH'])
+
+
+BUILD_ARCH_FILE = 'src/dynamite/_backend/.build_arch'
+def read_build_arch():
+    '''
+    The PETSc build (PETSC_DIR/PETSC_ARCH) that the backend object files
+    were last compiled against, or None if unknown.
+    '''
+    if not os.path.exists(BUILD_ARCH_FILE):
+        return None
+
+    with open(BUILD_ARCH_FILE) as f:
+        return f.read().strip()
+
+
 USE_CUDA = None
 def check_cuda():
     '''
@@ -198,9 +326,7 @@ def check_cuda():
     if USE_CUDA is not None:
         return USE_CUDA
 
-    with open(os.path.join(os.environ['PETSC_DIR'],
-                           os.environ['PETSC_ARCH'],
-                           'include/petscconf.h')) as f:
+    with open(os.path.join(get_petsc_build(), 'include/petscconf.h')) as f:
         for line in f:
             if 'PETSC_HAVE_CUDA 1' in line:
                 USE_CUDA = True
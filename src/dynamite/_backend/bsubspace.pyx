@@ -222,6 +222,12 @@ def compute_rcm(PetscInt [:] masks, PetscInt [:] signs, np.complex128_t [:] coef
     nterms = len(masks)
     max_states = len(state_map)
 
+    # bounds checking is disabled, so make sure the indexing below is valid
+    if nterms == 0:
+        raise ValueError('operator has no terms')
+    if max_states == 0:
+        raise ValueError('state_map size too small')
+
     # preallocate memory so we don't reallocate all the time
     seen_states.reserve(max_states)
 
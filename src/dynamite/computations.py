@@ -1,10 +1,28 @@
 
 from . import config
 from .states import State
+from .subspaces import Full
 from .tools import complex_enabled
 from .msc_tools import dnm_int_t
 
 import numpy as np
+from scipy.linalg import eigh, svdvals
+from functools import lru_cache
+import math
+
+_SLEPc = None
+def _get_slepc():
+    '''
+    Initialize PETSc/SLEPc if necessary, and return the slepc4py.SLEPc module.
+    The module is stored after the first call, so that functions called many
+    times in a loop (like evolve) don't repeat the initialization check and import.
+    '''
+    global _SLEPc
+    if _SLEPc is None:
+        config._initialize()
+        from slepc4py import SLEPc
+        _SLEPc = SLEPc
+    return _SLEPc
 
 def evolve(H, state, t, result=None, tol=None, ncv=None, algo=None, max_its=None):
     r"""
@@ -54,6 +72,14 @@ def evolve(H, state, t, result=None, tol=None, ncv=None, algo=None, max_its=None
     max_its : int, optional
         Maximum number of iterations for the solver.
 
+    .. note::
+        The solver, including its Krylov workspace of roughly ``ncv+1`` vectors
+        the size of the state, stays allocated on ``H`` after this function
+        returns, so that later evolutions under the same Hamiltonian can reuse
+        it. One solver is kept per pair of subspaces; calling with different
+        solver options replaces it. Call :meth:`dynamite.operators.Operator.destroy_mat`
+        to free it.
+
     Returns
     -------
     dynamite.states.State
@@ -61,8 +87,7 @@ def evolve(H, state, t, result=None, tol=None, ncv=None, algo=None, max_its=None
     """
     state.assert_initialized()
 
-    config._initialize()
-    from slepc4py import SLEPc
+    SLEPc = _get_slepc()
 
     H.establish_L()
 
@@ -79,31 +104,48 @@ def evolve(H, state, t, result=None, tol=None, ncv=None, algo=None, max_its=None
         state.copy(result)
         return result
 
-    if not complex_enabled() and t.real != 0:
+    if t.real != 0 and not complex_enabled():
         raise ValueError('configure PETSc to use complex numbers to '
                          'perform real time evolution')
 
-    mfn = SLEPc.MFN().create()
-    f = mfn.getFN()
-    f.setType(SLEPc.FN.Type.EXP)
+    subspaces = (state.subspace, state.subspace)
+    mat = H.get_mat(subspaces=subspaces)
+
+    # setting up the solver is expensive relative to short evolutions, so we
+    # keep it around on the operator and only change the time on later calls.
+    # only one solver is kept per matrix, so that its workspace is not
+    # duplicated when the solver options change
+    params = (algo, ncv, tol, max_its)
+    mfn_params, mfn = H._mfns.get(subspaces, (None, None))
+    if mfn is not None and mfn_params != params:
+        H._destroy_mfns(subspaces)
+        mfn = None
+
+    if mfn is None:
+        mfn = SLEPc.MFN().create()
+        mfn.getFN().setType(SLEPc.FN.Type.EXP)
+
+        if algo is not None:
+            mfn.setType(algo)
+        else:
+            mfn.setType('expokit')
 
-    scale = -1j*t
-    if scale.imag == 0:  # imaginary time evolution, scale is real
-        scale = scale.real
-    f.setScale(scale)
+        if ncv is not None:
+            mfn.setDimensions(ncv)
 
-    if algo is not None:
-        mfn.setType(algo)
-    else:
-        mfn.setType('expokit')
+        mfn.setTolerances(tol=tol, max_it=max_its)
 
-    if ncv is not None:
-        mfn.setDimensions(ncv)
+        mfn.setFromOptions()
+        mfn.setOperator(mat)
 
-    mfn.setTolerances(tol=tol, max_it=max_its)
+        H._mfns[subspaces] = (params, mfn)
 
-    mfn.setFromOptions()
-    mfn.setOperator(H.get_mat(subspaces=(state.subspace, state.subspace)))
+    # scale = -1j*t, but kept real for imaginary time evolution
+    if t.real == 0:
+        scale = t.imag
+    else:
+        scale = complex(t.imag, -t.real)
+    mfn.getFN().setScale(scale)
 
     mfn.solve(state.vec,result.vec)
 
@@ -121,6 +163,14 @@ def evolve(H, state, t, result=None, tol=None, ncv=None, algo=None, max_its=None
 
     return result
 
+# map from the options for eigsolve's "which" argument to SLEPc.EPS.Which
+_EPS_WHICH = {
+    'smallest': 'SMALLEST_REAL',
+    'largest': 'LARGEST_REAL',
+    'exterior': 'LARGEST_MAGNITUDE',
+    'target': 'TARGET_MAGNITUDE',
+}
+
 def eigsolve(H, getvecs=False, nev=1, which='smallest', target=None, tol=None, subspace=None, max_its=None):
     r"""
     Solve for a subset of the eigenpairs of the Hamiltonian.
@@ -190,6 +240,11 @@ def eigsolve(H, getvecs=False, nev=1, which='smallest', target=None, tol=None, s
         and a list of the corresponding eigenvectors.
     """
 
+    # check this before doing anything expensive like building the matrix
+    if which not in _EPS_WHICH:
+        raise ValueError(f'invalid value for which: "{which}". Options are: ' +
+                         ', '.join(f'"{k}"' for k in _EPS_WHICH))
+
     H.establish_L()
 
     if subspace is None:
@@ -197,8 +252,7 @@ def eigsolve(H, getvecs=False, nev=1, which='smallest', target=None, tol=None, s
     elif not H.has_subspace(subspace):
         raise ValueError('Requested subspace has not been added to operator.')
 
-    config._initialize()
-    from slepc4py import SLEPc
+    SLEPc = _get_slepc()
 
     eps = SLEPc.EPS().create()
     eps.setProblemType(SLEPc.EPS.ProblemType.HEP)
@@ -221,12 +275,7 @@ def eigsolve(H, getvecs=False, nev=1, which='smallest', target=None, tol=None, s
 
     eps.setDimensions(nev)
 
-    eps.setWhichEigenpairs({
-        'smallest':SLEPc.EPS.Which.SMALLEST_REAL,
-        'largest':SLEPc.EPS.Which.LARGEST_REAL,
-        'exterior':SLEPc.EPS.Which.LARGEST_MAGNITUDE,
-        'target':SLEPc.EPS.Which.TARGET_MAGNITUDE,
-        }[which])
+    eps.setWhichEigenpairs(getattr(SLEPc.EPS.Which, _EPS_WHICH[which]))
 
     eps.setTolerances(tol=tol, max_it=max_its)
 
@@ -252,21 +301,21 @@ def eigsolve(H, getvecs=False, nev=1, which='smallest', target=None, tol=None, s
         raise ConvergenceError('eigsolver failed to converge')
 
     evals = np.ndarray((nconv,), dtype=float)
-    evecs = []
 
-    for i in range(nconv):
-        evals[i] = eps.getEigenpair(i, None).real
-        if getvecs:
-            v = State(L=H.L, subspace=H.subspace)
-            eps.getEigenpair(i, v.vec)
-            v.set_initialized()
-            evecs.append(v)
-
-    if getvecs:
-        return (evals,evecs)
-    else:
+    if not getvecs:
+        get_eigenvalue = eps.getEigenvalue
+        evals[:] = [get_eigenvalue(i).real for i in range(nconv)]
         return evals
 
+    evecs = []
+    for i in range(nconv):
+        v = State(L=H.L, subspace=H.subspace)
+        evals[i] = eps.getEigenpair(i, v.vec).real
+        v.set_initialized()
+        evecs.append(v)
+
+    return (evals,evecs)
+
 def reduced_density_matrix(state, keep):
     """
     Compute the reduced density matrix of a state vector by
@@ -301,27 +350,75 @@ def reduced_density_matrix(state, keep):
         raise ValueError('reduced density matrices currently only supported '
                          'for product state basis subspace types.')
 
-    keep = np.array(keep, dtype=dnm_int_t)
+    keep = _check_keep(state, keep)
 
     if keep.size == 0:
         return np.array([[1]], dtype=np.complex128)
 
-    for n in range(1, keep.size):
-        if keep[n] <= keep[n-1]:
-            raise ValueError('keep array must be strictly increasing')
+    dm = bpetsc.reduced_density_matrix(
+        state.vec, state.subspace._to_c(), keep
+    )
+
+    return dm
+
+def _check_keep(state, keep):
+    '''
+    Validate an array of spin indices to keep when tracing out part of
+    ``state``, and convert it to a numpy array of the right integer type.
+    '''
+    keep = np.array(keep, dtype=dnm_int_t)
 
-    if any(idx < 0 for idx in keep):
+    if keep.ndim != 1:
+        raise ValueError('keep must be a one-dimensional array of spin indices')
+
+    if np.any(np.diff(keep) <= 0):
+        raise ValueError('keep array must be strictly increasing')
+
+    if np.any(keep < 0):
         raise ValueError('spin index less than zero. keep: %s' % str(keep))
 
-    if any(idx > state.L for idx in keep):
+    if np.any(keep >= state.L):
         raise ValueError('spin index greater than spin chain length minus one. keep: %s'
                          % str(keep))
 
-    dm = bpetsc.reduced_density_matrix(
-        state.vec, state.subspace._to_c(), keep
-    )
+    return keep
 
-    return dm
+def _use_schmidt_weights(state, keep):
+    '''
+    Whether to get the entanglement spectrum from :meth:`_schmidt_weights`
+    rather than from the reduced density matrix. That requires the whole state
+    on one process and costs a few copies of the state vector, so it only pays
+    off for a Full space state cut near the middle, where the density matrix
+    is about as large as the state itself.
+    '''
+    config._initialize()
+    from petsc4py import PETSc
+
+    return (PETSc.COMM_WORLD.size == 1 and
+            isinstance(state.subspace, Full) and
+            state.L//2 - 1 <= keep.size <= state.L//2)
+
+def _schmidt_weights(state, keep):
+    '''
+    Compute the eigenvalues of the reduced density matrix on the spins in
+    ``keep``, as the squared singular values of the state vector reshaped into
+    a matrix whose rows index the kept spins and whose columns index the
+    traced-out ones. This avoids building the density matrix at all, but
+    requires the whole state vector on one process.
+    '''
+    v = state.vec.getArray(readonly=True)
+
+    # in C ordering, spin i corresponds to axis L-1-i
+    v = v.reshape((2,)*state.L)
+    keep_axes = [state.L-1-idx for idx in keep]
+    trace_axes = [ax for ax in range(state.L) if ax not in keep_axes]
+    M = v.transpose(keep_axes + trace_axes).reshape(1 << keep.size, -1)
+
+    # the transpose and reshape usually copy the state, in which case the SVD
+    # may work in place; for a cut of at most one spin M is still a view of
+    # the state vector, which must not be overwritten
+    s = svdvals(M, overwrite_a=not np.may_share_memory(M, v), check_finite=False)
+    return s*s
 
 def entanglement_entropy(state, keep):
     """
@@ -329,7 +426,10 @@ def entanglement_entropy(state, keep):
     spin chain. To be precise, this is the bipartite entropy of
     entanglement.
 
-    Currently, this quantity is computed entirely on process 0.
+    On a single process, for a state on the Full space and a cut near the
+    middle of the chain, the entanglement spectrum is computed directly from
+    the singular values of the state, without building the reduced density matrix.
+    Otherwise, this quantity is computed entirely on process 0.
     As a result, the function returns ``-1`` on all other processes.
 
     Parameters
@@ -347,13 +447,23 @@ def entanglement_entropy(state, keep):
         The entanglement entropy
     """
 
+    state.assert_initialized()
+
+    # for a balanced cut we can skip the density matrix and get its
+    # spectrum directly from the singular values of the state
+    if state.subspace.product_state_basis:
+        keep = _check_keep(state, keep)
+        if _use_schmidt_weights(state, keep):
+            return _spectrum_entropy(_schmidt_weights(state, keep))
+
     reduced = reduced_density_matrix(state, keep)
 
     # currently everything computed on process 0
     if reduced[0,0] == -1:
         return -1
 
-    rtn = dm_entanglement_entropy(reduced)
+    # the density matrix is ours, so the eigensolver can work in place
+    rtn = _spectrum_entropy(_dm_eigvals(reduced, overwrite=True))
     return rtn
 
 def dm_entanglement_entropy(dm):
@@ -363,22 +473,46 @@ def dm_entanglement_entropy(dm):
     Parameters
     ----------
     dm : np.array
-        A density matrix
+        A density matrix. May also be a CuPy array, in which case the
+        computation is done on the GPU.
 
     Returns
     -------
     float
         The Von Neumann entropy
     '''
-    w = np.linalg.eigvalsh(dm)
+    w = _dm_eigvals(dm)
+    rtn = _spectrum_entropy(w)
+    return rtn
+
+def _dm_eigvals(dm, overwrite=False):
+    '''
+    The eigenvalues of a density matrix, clipped to be non-negative. If
+    ``overwrite`` is True, the contents of ``dm`` are destroyed.
+    '''
+    xp = _array_module(dm)
+    if xp is not np:
+        # only the eigenvalues need to come back from the GPU
+        w = xp.linalg.eigvalsh(dm).get()
+    else:
+        # the RRR driver is faster than the default divide-and-conquer one when
+        # we don't need eigenvectors
+        w = eigh(dm, eigvals_only=True, driver='evr',
+                 overwrite_a=overwrite, check_finite=False)
 
-    # this is required because numpy leaves uninitialized data in the
-    # out vector unless you explicitly zero it :-(
-    log = np.zeros(w.shape)
-    np.log(w, where=w > 0, out=log)
+    # rounding error can leave eigenvalues that should be zero slightly
+    # negative, which would give nan in logs and fractional powers
+    np.clip(w, 0, None, out=w)
+    return w
 
-    rtn = -np.sum(w * log)
-    return rtn
+def _spectrum_entropy(w):
+    '''
+    The Von Neumann entropy of a density matrix with (non-negative) eigenvalues ``w``.
+    '''
+    # zero eigenvalues contribute nothing, and dropping them lets the
+    # multiply and sum happen in a single BLAS dot product
+    w = w[w > 0]
+    return -np.dot(w, np.log(w))
 
 def renyi_entropy(state, keep, alpha, method='eigsolve'):
     r"""
@@ -392,8 +526,13 @@ def renyi_entropy(state, keep, alpha, method='eigsolve'):
     Arbitrary non-negative values of ``alpha`` are allowed; in the special cases
     of :math:`\alpha \in \{ 0, 1 \}` the function is computed in the limit.
 
-    Currently, this quantity is computed entirely on process 0.
-    As a result, the function returns ``-1`` on all other processes.
+    In the cases where :meth:`entanglement_entropy` computes the spectrum of the
+    density matrix directly from the singular values of the state, so does this
+    function, and ``method`` only affects which values of ``alpha`` are accepted.
+    Otherwise, this quantity is computed entirely on process 0. As a result, the
+    function returns ``-1`` on all other processes. Note that in that case the
+    full reduced density matrix, of dimension ``2**len(keep)``, is built on
+    process 0, which takes a lot of memory when many spins are kept.
 
     Parameters
     ----------
@@ -404,8 +543,10 @@ def renyi_entropy(state, keep, alpha, method='eigsolve'):
         A list of spin indices to keep. See :meth:`reduced_density_matrix` for
         details.
 
-    alpha : float, int, or str
-        The value of :math:`\alpha` from the definition of Renyi entropy.
+    alpha : float, int, str, or list
+        The value of :math:`\alpha` from the definition of Renyi entropy. If a list
+        of values is passed, the entropy is computed for each of them, solving for
+        the spectrum of the density matrix only once.
 
     method : str, optional
         Whether to compute the Renyi entropy by solving for eigenvalues, or computing
@@ -414,10 +555,27 @@ def renyi_entropy(state, keep, alpha, method='eigsolve'):
 
     Returns
     -------
-    float
-        The Renyi entropy
+    float or numpy.ndarray
+        The Renyi entropy, or an array of entropies if ``alpha`` is a list
     """
 
+    state.assert_initialized()
+
+    # check up front, so the same errors are raised on every process and
+    # whichever way the spectrum is computed
+    _check_renyi_method(alpha, method)
+
+    # as in entanglement_entropy, this avoids building the density matrix
+    # for a balanced cut
+    if state.subspace.product_state_basis:
+        keep = _check_keep(state, keep)
+        if _use_schmidt_weights(state, keep):
+            w = _schmidt_weights(state, keep)
+
+            if np.ndim(alpha) > 0:
+                return np.array([_eigs_renyi_entropy(w, a) for a in alpha], dtype=float)
+            return _eigs_renyi_entropy(w, alpha)
+
     reduced = reduced_density_matrix(state, keep)
 
     # currently everything computed on process 0
@@ -428,69 +586,141 @@ def renyi_entropy(state, keep, alpha, method='eigsolve'):
     return rtn
 
 def dm_renyi_entropy(dm, alpha, method='eigsolve'):
-    '''
+    r'''
     Compute the Renyi entropy of a density matrix. See :meth:`renyi_entropy`
     for details.
 
     Parameters
     ----------
     dm : np.array
-        A density matrix
+        A density matrix. May also be a CuPy array, in which case the
+        computation is done on the GPU.
 
-    alpha : int, float, or str
-        The value of alpha in the definition of Renyi entropy.
+    alpha : int, float, str, or list
+        The value of alpha in the definition of Renyi entropy, or a list of values.
 
     method : str
         Whether to compute the Renyi entropy by solving for eigenvalues, or computing
         a matrix power and doing a trace. One or the other may be faster depending on the
-        specific problem. Options: ``eigsolve`` or ``matrix_power``.
+        specific problem. Options: ``eigsolve`` or ``matrix_power``. For
+        :math:`\alpha \in \{2, 3, 4\}`, ``eigsolve`` skips the eigensolve and
+        computes the trace directly, which is much faster.
 
     Returns
     -------
-    float
-        The Renyi entropy
+    float or numpy.ndarray
+        The Renyi entropy, or an array of entropies if ``alpha`` is a list
     '''
 
-    # special cases
-    if alpha == 0: # H_0 = log|X|
-        eps = 1E-10
-        eigs = np.linalg.eigvalsh(dm)
-        support = np.sum(eigs > eps)
-        return np.log(support)
-
-    elif alpha == 1: # H_1 = Von Neumann entropy
-        return dm_entanglement_entropy(dm)
+    if np.ndim(alpha) > 0:
+        # solve for the eigenvalues at most once for all values of alpha
+        w = None
+        rtn = np.ndarray((len(alpha),), dtype=float)
+        for i, a in enumerate(alpha):
+            if a in (0, 1, 'inf') or (method == 'eigsolve' and a not in (2, 3, 4)):
+                if w is None:
+                    w = _dm_eigvals(dm)
+                rtn[i] = _eigs_renyi_entropy(w, a)
+            else:
+                rtn[i] = dm_renyi_entropy(dm, a, method)
+        return rtn
 
-    elif alpha == 'inf':
-        eigs = np.linalg.eigvalsh(dm)
-        return -np.log(np.max(eigs))
+    # special cases
+    if alpha in (0, 1, 'inf'):
+        return _eigs_renyi_entropy(_dm_eigvals(dm), alpha)
 
     # compute the trace of rho**alpha
     if method == 'matrix_power':
         if alpha == int(alpha):
-            powered = np.linalg.matrix_power(dm, int(alpha))
+            trace = _power_trace(dm, int(alpha))
         else:
             raise TypeError('alpha must be an integer for matrix_power method.')
-        trace = np.trace(powered).real
 
     elif method == 'eigsolve':
-        w = np.linalg.eigvalsh(dm)
-        trace = np.sum(w**alpha)
+        if alpha in (2, 3, 4):
+            # much cheaper than an eigensolve for small integer alpha
+            trace = _power_trace(dm, int(alpha))
+        else:
+            return _eigs_renyi_entropy(_dm_eigvals(dm), alpha)
 
     else:
         raise ValueError('Valid methods are "eigsolve" and "matrix_power"')
 
     return 1/(1-alpha) * np.log(trace)
 
+def _check_renyi_method(alpha, method):
+    '''
+    Raise the same errors for ``alpha`` and ``method`` that
+    :meth:`dm_renyi_entropy` would.
+    '''
+    if method not in ('eigsolve', 'matrix_power'):
+        raise ValueError('Valid methods are "eigsolve" and "matrix_power"')
+
+    if method == 'matrix_power':
+        for a in (alpha if np.ndim(alpha) > 0 else [alpha]):
+            if a not in (0, 1, 'inf') and a != int(a):
+                raise TypeError('alpha must be an integer for matrix_power method.')
+
+def _eigs_renyi_entropy(w, alpha):
+    '''
+    Compute the Renyi entropy of a density matrix from its (non-negative)
+    eigenvalues ``w``.
+    '''
+    if alpha == 0: # H_0 = log|X|
+        eps = 1E-10
+        support = np.sum(w > eps)
+        return np.log(support)
+
+    elif alpha == 1: # H_1 = Von Neumann entropy
+        return _spectrum_entropy(w)
+
+    elif alpha == 'inf':
+        return -np.log(np.max(w))
+
+    return 1/(1-alpha) * np.log(np.sum(w**alpha))
+
+def _power_trace(dm, alpha):
+    r'''
+    Compute :math:`\mathrm{Tr} [ \rho^\alpha ]` for a Hermitian matrix and
+    integer :math:`\alpha`. Since powers of :math:`\rho` are Hermitian,
+    :math:`\mathrm{Tr} [ \rho^j \rho^k ]` is just ``np.vdot(rho**j, rho**k)``,
+    so only :math:`\rho^{\lfloor \alpha/2 \rfloor}` needs to be computed.
+    '''
+    xp = _array_module(dm)
+    half = xp.linalg.matrix_power(dm, alpha//2)
+    if alpha % 2 == 0:
+        return float(xp.vdot(half, half).real)
+    else:
+        return float(xp.vdot(half, half @ dm).real)
+
+def _array_module(a):
+    '''
+    The module (numpy, or cupy for arrays on a GPU) providing the array
+    operations for ``a``. CuPy is only imported if ``a`` is a CuPy array.
+    '''
+    if type(a).__module__.split('.')[0] == 'cupy':
+        import cupy
+        return cupy
+    return np
+
 def get_tstep(ncv,nrm,tol=1E-7):
     """
     Compute the length of a sub-step in a Expokit matrix
     exponential solve.
     """
-    f = ((ncv+1)/2.72)**(ncv+1) * np.sqrt(2*np.pi*(ncv+1))
+    f = _expokit_factor(ncv)
     t = ((1/nrm)*(f*tol)/(4.0*nrm))**(1/ncv)
-    s = 10.0**(np.floor(np.log10(t))-1)
-    return np.ceil(t/s)*s
+    s = 10.0**(math.floor(math.log10(t))-1)
+    return math.ceil(t/s)*s
+
+@lru_cache(maxsize=None)
+def _expokit_factor(ncv):
+    '''
+    The ncv-dependent factor in the Expokit step size. Note that Expokit (and
+    SLEPc's implementation of it) uses the literal 2.72 rather than e, so we
+    do too, to match the step size the solver actually takes.
+    '''
+    return ((ncv+1)/2.72)**(ncv+1) * math.sqrt(2*math.pi*(ncv+1))
 
 def estimate_compute_time(t,ncv,nrm,tol=1E-7):
     """
@@ -498,7 +728,7 @@ def estimate_compute_time(t,ncv,nrm,tol=1E-7):
     an expokit exponential solve.
     """
     tstep = get_tstep(ncv,nrm,tol)
-    iters = np.ceil(t/tstep)
+    iters = math.ceil(t/tstep)
     return ncv*iters
 
 class ConvergenceError(Exception):
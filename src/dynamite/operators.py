@@ -26,6 +26,7 @@ class Operator:
     def __init__(self):
         self._max_spin_idx = None
         self._mats = {}
+        self._mfns = {}
         self._msc = None
         self._is_reduced = False
         self._shell = config.shell
@@ -616,6 +617,8 @@ class Operator:
             gpu=config.gpu,
         )
 
+        # any cached solvers still refer to the old matrix
+        self._destroy_mfns(subspaces)
         self._mats[subspaces] = mat
 
     @classmethod
@@ -658,9 +661,10 @@ class Operator:
 
     def destroy_mat(self, subspaces=None):
         """
-        Destroy the PETSc matrix, freeing the corresponding memory. If the PETSc
-        matrix does not exist (has not been built or has already been destroyed),
-        the function has no effect.
+        Destroy the PETSc matrix, freeing the corresponding memory. Any time
+        evolution solver kept on the operator by :meth:`evolve` for the matrix is
+        destroyed too, freeing its workspace. If the PETSc matrix does not exist
+        (has not been built or has already been destroyed), the function has no effect.
 
         Parameters
         ----------
@@ -673,10 +677,20 @@ class Operator:
             to_destroy = list(self._mats.keys())
 
         for k in to_destroy:
+            self._destroy_mfns(k)
             mat = self._mats.pop(k, None)
             if mat is not None:
                 mat.destroy()
 
+    def _destroy_mfns(self, subspaces):
+        '''
+        Destroy the SLEPc MFN solver cached by :meth:`dynamite.computations.evolve`
+        for the matrix corresponding to the given pair of subspaces, if there is one.
+        '''
+        cached = self._mfns.pop(subspaces, None)
+        if cached is not None:
+            cached[1].destroy()
+
     def estimate_memory(self, mpi_size=None):
         '''
         Estimate the total amount of memory that will be used by this
@@ -690,6 +704,10 @@ class Operator:
         (such as XX+YY), this function will overestimate the required
         memory for non-shell matrices.
 
+        The estimate does not include the solver workspace that :meth:`evolve`
+        keeps on the operator (roughly ``ncv+1`` state vectors), which is freed
+        by :meth:`destroy_mat`.
+
         Parameters
         ----------
 
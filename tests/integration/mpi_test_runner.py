@@ -11,6 +11,11 @@ class MPITestCase(ut.TestCase):
     '''
     Test class specifically for MPI tests. Currently just makes the output
     prettier to be more compatible with the test runners below.
+
+    Assertions only involve the local process; whether a test passed on
+    every rank is combined by MPITestResult with a single allreduce after
+    the test finishes, so there is no need to batch assertions or to make
+    the same number of them on each rank.
     '''
 
     _skip_flags = None
@@ -174,26 +179,29 @@ class MPITestResult(ut.TestResult):
         self.comm.barrier()
 
     def _process_per_rank_errors(self):
-        for i in range(self.comm.size):
-            self.comm.barrier()
-            if self.comm.rank == i:
-                msg = ''
-                if not self.cur_failures:
-                    self._print('.', end=' ', verbose=[1,2])
-                else:
-                    self._print(color_error_string(self.cur_failures[0][0][0]),
-                                end=' ', verbose=[1, 2])
-                    for problem, fail_test, fail_msg in self.cur_failures:
-                        msg += "Rank {} {}:".format(
-                            self.comm.rank,
-                            color_error_string(problem)
-                        )
-
-                        if hasattr(fail_test, '_subDescription'):
-                            msg += " {}".format(fail_test._subDescription())
-
-                        msg += "\n"
-                        msg += fail_msg
+        msg = ''
+        if not self.cur_failures:
+            mark = '.'
+        else:
+            mark = color_error_string(self.cur_failures[0][0][0])
+            for problem, fail_test, fail_msg in self.cur_failures:
+                msg += "Rank {} {}:".format(
+                    self.comm.rank,
+                    color_error_string(problem)
+                )
+
+                if hasattr(fail_test, '_subDescription'):
+                    msg += " {}".format(fail_test._subDescription())
+
+                msg += "\n"
+                msg += fail_msg
+
+        # collect every rank's mark on process 0 in one collective, instead of
+        # having the ranks take turns printing between barriers
+        marks = self.comm.gather(mark, root=0)
+        if self.comm.rank == 0:
+            self._print(*marks, end=' ', verbose=[1,2])
+
         return msg
 
     def _collect_and_print_errors(self, test, msg):
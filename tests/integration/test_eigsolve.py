@@ -73,9 +73,8 @@ class Checker(dtr.DynamiteTestCase):
 
         prod.vec.scale(1/val)
 
-        istart, iend = vec.vec.getOwnershipRange()
-        local_prod = np.array(prod.vec[istart:iend])
-        local_evec = np.array(vec.vec[istart:iend])
+        local_prod = prod.vec.getArray(readonly=True)
+        local_evec = vec.vec.getArray(readonly=True)
 
         local_norm = np.linalg.norm(local_prod-local_evec)
 
@@ -1,6 +1,7 @@
 
 import numpy as np
 from scipy.sparse import linalg
+from functools import lru_cache
 import hamiltonians
 
 import dynamite_test_runner as dtr
@@ -31,12 +32,43 @@ class Analytic(dtr.DynamiteTestCase):
         H.evolve(ket, t = np.pi/2, result = bra)
         self.assertLess(np.abs(1 - np.abs(bra.dot(bra_check))), 1E-9)
 
+    def test_repeated(self):
+        # make sure the solver reused between calls picks up the new time,
+        # and the new matrix after it is rebuilt
+        H = index_product(sigmax())
+        bra, ket = H.create_states()
+        up, down = bra.copy(), bra.copy()
+
+        ket.set_product('D'*config.L)
+        up.set_product('U'*config.L)
+        down.set_product('D'*config.L)
+
+        for t, correct in [(np.pi/2, up), (np.pi, down)]:
+            with self.subTest(t=t):
+                H.evolve(ket, t=t, result=bra)
+                self.assertLess(np.abs(1 - np.abs(bra.dot(correct))), 1E-9)
+
+        H.destroy_mat()
+        H.evolve(ket, t=np.pi/2, result=bra)
+        self.assertLess(np.abs(1 - np.abs(bra.dot(up))), 1E-9)
+
+# only keep the most recent one; they can be large, and the tests
+# evolve under each Hamiltonian several times in a row
+@lru_cache(maxsize=1)
+def reference_matrix(H_name, L):
+    '''
+    The sparse matrix for one of the test Hamiltonians on the full space.
+    '''
+    return getattr(hamiltonians, H_name)().to_numpy()
+
+
 class EvolveChecker(dtr.DynamiteTestCase):
-    def evolve_check(self, H, t, **kwargs):
+    def evolve_check(self, H, t, H_np=None, **kwargs):
         bra, ket = H.create_states()
         ket.set_random(seed = 0)
 
-        H_np = H.to_numpy()
+        if H_np is None:
+            H_np = H.to_numpy()
         ket_np = ket.to_numpy()
 
         H.evolve(ket, t=t, result=bra, **kwargs)
@@ -48,7 +80,7 @@ class EvolveChecker(dtr.DynamiteTestCase):
 
         if ket_np is not None:
             bra_np = linalg.expm_multiply(-1j*t*H_np, ket_np)
-            inner_prod = bra_check.dot(bra_np.conj())
+            inner_prod = np.vdot(bra_np, bra_check)
             norm = bra.norm()
             self.assertLess(np.abs(1 - (inner_prod/(norm**2))), 1E-9,
                             msg=f'inner prod:{inner_prod}; norm^2:{norm**2}')
@@ -84,7 +116,8 @@ class Hamiltonians(EvolveChecker):
                         'imaginary': -1j,
                     }[evolve_type]
                     H = getattr(hamiltonians, H_name)()
-                    self.evolve_check(H, t*t_factor, **kwargs)
+                    H_np = reference_matrix(H_name, config.L)
+                    self.evolve_check(H, t*t_factor, H_np=H_np, **kwargs)
 
     def test_zero(self):
         if self.skip_flags['medium_only']:
@@ -12,6 +12,7 @@ from dynamite import config
 from dynamite.subspaces import Parity, Auto, SpinConserve, XParity
 from dynamite.states import State
 from dynamite.computations import reduced_density_matrix, entanglement_entropy, renyi_entropy
+from dynamite.computations import dm_entanglement_entropy, dm_renyi_entropy
 from dynamite.tools import complex_enabled
 
 class Explicit(dtr.DynamiteTestCase):
@@ -119,6 +120,22 @@ class Explicit(dtr.DynamiteTestCase):
             dtype=np.complex128)
         self.compare(dm, correct)
 
+    def test_state_unchanged(self):
+        # at small L a one-spin cut goes through the Schmidt values of the
+        # state, for which the state vector must not be touched
+        state = State(L=4, state='random', seed=0)
+        correct = state.to_numpy()
+
+        for keep in [[], [0]]:
+            with self.subTest(keep=keep):
+                entanglement_entropy(state, keep)
+                renyi_entropy(state, keep, [0.5, 2])
+
+                check = state.to_numpy()
+                if check is not None: # process 0
+                    self.assertTrue(np.array_equal(check, correct),
+                                    msg='\ncheck: %s\ncorrect: %s' % (str(check), str(correct)))
+
     @ut.skipIf(not complex_enabled(), 'complex numbers not enabled')
     def test_L4(self):
         state_vals = [
@@ -271,6 +288,41 @@ class FullSpace(Checker):
 
                 self.compare_rdm(keep, correct)
 
+    def test_entropy_matches_rdm(self):
+        self.state.set_random(seed=0)
+
+        for keep in [[0], list(range(self.state.L//2)), [1, self.state.L-1]]:
+            with self.subTest(keep=keep):
+                check = entanglement_entropy(self.state, keep)
+                dm = reduced_density_matrix(self.state, keep)
+
+                if dm[0,0] != -1: # process 0
+                    correct = dm_entanglement_entropy(dm)
+                    self.assertTrue(np.isclose(check, correct, atol=1E-10, rtol=0),
+                                    msg='\ncheck: %s\ncorrect: %s' % (str(check), str(correct)))
+
+    def test_renyi_matches_rdm(self):
+        self.state.set_random(seed=0)
+        alphas = [0, 0.5, 1, 2, 3, 'inf']
+
+        for keep in [[0], list(range(self.state.L//2)), [1, self.state.L-1]]:
+            with self.subTest(keep=keep):
+                check = renyi_entropy(self.state, keep, alphas)
+                dm = reduced_density_matrix(self.state, keep)
+
+                if dm[0,0] != -1: # process 0
+                    correct = dm_renyi_entropy(dm, alphas)
+                    self.assertTrue(np.allclose(check, correct, atol=1E-10, rtol=0),
+                                    msg='\ncheck: %s\ncorrect: %s' % (str(check), str(correct)))
+
+    def test_renyi_matrix_power_noninteger(self):
+        self.state.set_random(seed=0)
+
+        for keep in [[0], list(range(self.state.L//2))]:
+            with self.subTest(keep=keep):
+                with self.assertRaises(TypeError):
+                    renyi_entropy(self.state, keep, 0.5, method='matrix_power')
+
 class EvenParitySpace(FullSpace):
     def setUp(self):
         self.state = State(subspace=Parity('even'))
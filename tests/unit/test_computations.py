@@ -1,5 +1,21 @@
-"""
-Currently, there are no unit tests for this module, because its functions
-essentially just are interfaces to the backend. They are tested by the
-integration tests.
-"""
+'''
+Unit tests for computations.py.
+
+Most of the functions in this module essentially just are interfaces to the
+backend, so they are tested by the integration tests. The tests here only
+cover the checks done before the backend is called.
+'''
+
+import unittest as ut
+
+from dynamite.computations import eigsolve
+from dynamite.operators import identity
+
+class Eigsolve(ut.TestCase):
+
+    def test_which_exception(self):
+        with self.assertRaises(ValueError):
+            eigsolve(identity(), which='smalest')
+
+if __name__ == '__main__':
+    ut.main()
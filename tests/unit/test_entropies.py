@@ -3,6 +3,8 @@ Test computation of Von Neumann and Renyi entropies.
 '''
 
 import unittest as ut
+from unittest.mock import patch
+from types import ModuleType, SimpleNamespace
 import numpy as np
 
 from dynamite.computations import dm_entanglement_entropy, dm_renyi_entropy
@@ -50,6 +52,12 @@ class VonNeumann(ut.TestCase):
         ], dtype=np.complex128)
         self.check_entropy(dm, 0.9691946314869655)
 
+    def test_rank_deficient(self):
+        # eigenvalues that should be exactly zero may come out slightly negative
+        v = np.array([1, 1j, -1, 1], dtype=np.complex128) / 2
+        dm = np.outer(v, v.conj())
+        self.check_entropy(dm, 0.0)
+
 class Renyi(ut.TestCase):
 
     def check_entropy(self, dm, correct):
@@ -153,5 +161,93 @@ class Renyi(ut.TestCase):
         ]
         self.check_entropy(dm, tests)
 
+    def test_random_integer(self):
+        dm = np.array([
+            [ (0.333204+0j),(-0.1112-0.113795j),(-0.099827+0.069346j),(-0.002388-0.022364j) ],
+            [ (-0.1112+0.113795j),(0.196206+0j),(0.001052-0.11965j),(0.111748-0.009399j) ],
+            [ (-0.099827-0.069346j),(0.001052+0.11965j),(0.180806+0j),(0.088287+0.120957j) ],
+            [ (-0.002388+0.022364j),(0.111748+0.009399j),(0.088287-0.120957j),(0.289469+0j) ],
+        ], dtype=np.complex128)
+        w = np.linalg.eigvalsh(dm)
+        tests = [(n, np.log(np.sum(w**n))/(1-n)) for n in (2, 3, 4, 5)]
+        self.check_entropy(dm, tests)
+
+    def test_alpha_list(self):
+        dm =  (3/4) * np.array([[0.5, -0.5j], [0.5j, 0.5]], dtype=np.complex128)
+        dm += (1/4) * np.array([[0.5, 0.5j], [-0.5j, 0.5]], dtype=np.complex128)
+        tests = [
+            ('eigsolve', [0, 1, 2, 2.5, 3, 'inf']),
+            ('matrix_power', [0, 1, 2, 3, 'inf']),
+        ]
+        for method, alphas in tests:
+            with self.subTest(method=method):
+                check = dm_renyi_entropy(dm, alphas, method)
+                self.assertEqual(check.shape, (len(alphas),))
+                for a, val in zip(alphas, check):
+                    correct = dm_renyi_entropy(dm, a, method)
+                    self.assertTrue(np.isclose(val, correct, rtol=0, atol=1E-14),
+                                    msg = '\nalpha: %s\ncheck: %s\ncorrect: %s' % (str(a), str(val), str(correct)))
+
+class FakeCupyArray(np.ndarray):
+    '''
+    Stands in for a CuPy array: dynamite decides whether to dispatch to CuPy
+    from the module of the array's type.
+    '''
+    __module__ = 'cupy'
+
+    def get(self):
+        return np.asarray(self)
+
+class CuPy(ut.TestCase):
+
+    def setUp(self):
+        # a fake cupy module backed by numpy, which records what it is asked to do
+        self.calls = []
+
+        def record(name, f):
+            def wrapped(*args):
+                self.calls.append(name)
+                return np.asarray(f(*args)).view(FakeCupyArray)
+            return wrapped
+
+        cupy = ModuleType('cupy')
+        cupy.linalg = SimpleNamespace(
+            eigvalsh=record('eigvalsh', np.linalg.eigvalsh),
+            matrix_power=record('matrix_power', np.linalg.matrix_power),
+        )
+        cupy.vdot = record('vdot', np.vdot)
+
+        patcher = patch.dict('sys.modules', {'cupy': cupy})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.dm_np =  (3/4) * np.array([[0.5, -0.5j], [0.5j, 0.5]], dtype=np.complex128)
+        self.dm_np += (1/4) * np.array([[0.5, 0.5j], [-0.5j, 0.5]], dtype=np.complex128)
+        self.dm = self.dm_np.copy().view(FakeCupyArray)
+
+    def check_result(self, check, correct):
+        # the result should come back to the host as a plain float
+        self.assertIsInstance(check, float)
+        self.assertTrue(np.isclose(check, correct, rtol=0, atol=1E-14),
+                        msg = '\ncheck: %s\ncorrect: %s' % (str(check), str(correct)))
+
+    def test_entanglement_entropy(self):
+        check = dm_entanglement_entropy(self.dm)
+        self.assertEqual(self.calls, ['eigvalsh'])
+        self.check_result(check, dm_entanglement_entropy(self.dm_np))
+
+    def test_renyi_eigsolve(self):
+        check = dm_renyi_entropy(self.dm, 2.5, 'eigsolve')
+        self.assertEqual(self.calls, ['eigvalsh'])
+        self.check_result(check, dm_renyi_entropy(self.dm_np, 2.5, 'eigsolve'))
+
+    def test_renyi_matrix_power(self):
+        for alpha in (2, 3):
+            with self.subTest(alpha=alpha):
+                self.calls.clear()
+                check = dm_renyi_entropy(self.dm, alpha, 'matrix_power')
+                self.assertEqual(self.calls, ['matrix_power', 'vdot'])
+                self.check_result(check, dm_renyi_entropy(self.dm_np, alpha, 'matrix_power'))
+
 if __name__ == '__main__':
     ut.main()